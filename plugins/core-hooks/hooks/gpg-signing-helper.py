@@ -45,11 +45,25 @@ Limitations:
 - Only monitors Bash tool (not git commands from other tools)
 """
 import json
+import re
 import sys
 
-try:
-    input_data = json.load(sys.stdin)
+# GPG signing failure messages; any one of them triggers the guidance
+GPG_ERROR_PATTERNS = (
+    "gpg failed to sign the data",
+    "gpg: can't connect to the agent",
+    "No agent running",
+)
+GPG_ERROR_PATTERN = re.compile("|".join(re.escape(p) for p in GPG_ERROR_PATTERNS))
 
+
+def detect_gpg_error(error_output):
+    """Return True if the error text contains a GPG signing failure message."""
+    return bool(error_output) and GPG_ERROR_PATTERN.search(error_output) is not None
+
+
+def process(input_data):
+    """Return the hook output for one parsed hook input."""
     # Get error from either location:
     # - PostToolUseFailure: top-level "error" field
     # - PostToolUse: "tool_result.error" field
@@ -58,35 +72,36 @@ try:
         tool_result = input_data.get("tool_result", {})
         error_output = tool_result.get("error", "")
 
-    # Check if the Bash command failed
-    if error_output:
-
-        # Detect GPG signing failure
-        if "gpg failed to sign the data" in error_output or \
-           "gpg: can't connect to the agent" in error_output or \
-           "No agent running" in error_output:
-
-            # Output educational message to Claude via additionalContext
-            # Note: decision="block" doesn't work for PostToolUseFailure
-            output = {
-                "hookSpecificOutput": {
-                    "hookEventName": "PostToolUseFailure",
-                    "additionalContext": (
-                        f"GPG SIGNING ERROR DETECTED: {error_output}\n\n"
-                        "GPG signing is not available in sandbox mode. "
-                        "Use the --no-gpg-sign flag for your commit:\n\n"
-                        "git commit --no-gpg-sign -m \"your message\"\n\n"
-                        "IMPORTANT: All git commits in sandbox require --no-gpg-sign."
-                    )
-                }
+    # Detect GPG signing failure in the failed command's error
+    if detect_gpg_error(error_output):
+
+        # Output educational message to Claude via additionalContext
+        # Note: decision="block" doesn't work for PostToolUseFailure
+        return {
+            "hookSpecificOutput": {
+                "hookEventName": "PostToolUseFailure",
+                "additionalContext": (
+                    f"GPG SIGNING ERROR DETECTED: {error_output}\n\n"
+                    "GPG signing is not available in sandbox mode. "
+                    "Use the --no-gpg-sign flag for your commit:\n\n"
+                    "git commit --no-gpg-sign -m \"your message\"\n\n"
+                    "IMPORTANT: All git commits in sandbox require --no-gpg-sign."
+                )
             }
-            print(json.dumps(output))
-            sys.exit(0)
+        }
 
-    # No error detected - output empty JSON
-    print("{}")
+    # No error detected - empty output
+    return {}
+
+
+def main():
+    print(json.dumps(process(json.load(sys.stdin))))
     sys.exit(0)
 
-except Exception:
-    print("{}")
-    sys.exit(1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception:
+        print("{}")
+        sys.exit(1)
@@ -13,7 +13,10 @@ improving performance and user experience.
 Behavior:
 - Detects usage of `find` command → suggests `fd` if available
 - Detects usage of `grep` command → suggests `rg` (ripgrep) if available
-- Checks tool availability dynamically using `which` command
+- Parses the command with `shlex` and only looks at words in command position
+  (start of a line, after `|`, `&&`, `;`, `$(`, a backtick, `xargs`, `sudo`,
+  `find -exec`, ...); the word after a redirect (`>`, `2>`, `<`, ...) is its target
+- Checks tool availability dynamically by searching PATH (`shutil.which`)
 - Provides context-aware guidance with example syntax
 - Only triggers if the modern alternative tool is installed
 
@@ -27,6 +30,8 @@ Does NOT trigger when:
 - Command is empty or missing
 - Non-Bash tools (Read, Edit, Write, etc.)
 - Within `grep` detection: if command already uses `rg` (ripgrep)
+- `find`/`grep` only appear inside quoted strings, filenames, or variable names
+- `find`/`grep` is only the target of a redirect (e.g. `echo hi > grep`)
 
 Suggestions provided:
 - fd: Faster file search, simpler syntax, respects .gitignore by default
@@ -46,6 +51,8 @@ Benefits:
 Limitations:
 - Only suggests if tool is available (doesn't fail if tool isn't installed)
 - Detection is command-based, not intelligent about context
+- Heredoc bodies are read as commands, so a `grep` line inside one triggers
+- Options of prefix commands that take a value (e.g. `xargs -n 1 grep`) hide the command that follows
 - Won't suggest if user explicitly needs standard POSIX find/grep for compatibility
 - Silent if suggested tool isn't in PATH (respects user's environment)
 
@@ -54,27 +61,87 @@ Examples:
 - `grep -r "pattern" .` → suggests `rg "pattern"`
 - `find /path -type f -exec` → suggests `fd` with appropriate flags
 """
+import functools
 import json
+import shlex
 import sys
-import subprocess
+import shutil
 import os
 
-# Cache for tool availability (checked once per hook execution)
-_tool_cache = {}
+# Characters that make up shell operators (|, &&, ;, newline, $( ... ), `...`, redirects)
+OPERATOR_CHARS = frozenset("();<>|&`\n")
+# Characters that make an operator a redirect, whose next word is a file, not a command
+REDIRECT_CHARS = frozenset("<>")
+# Words after which the next word is still in command position
+COMMAND_PREFIXES = frozenset({
+    "xargs", "sudo", "env", "time", "nohup", "exec", "command", "nice",
+    "if", "then", "else", "elif", "while", "until", "do", "!", "{",
+})
+# find actions whose arguments are a command
+FIND_EXEC_FLAGS = frozenset({"-exec", "-execdir", "-ok", "-okdir"})
+
+def tokenize(command):
+    """Split a command line into shell words, with operators as separate tokens."""
+    # Join continued lines, as the shell does, so only real newlines separate commands
+    command = command.replace("\\\n", "")
+    lexer = shlex.shlex(command, posix=True, punctuation_chars="".join(OPERATOR_CHARS))
+    lexer.whitespace = " \t\r"
+    # No comment handling: shlex would cut `${#arr[@]}` or `url#frag` mid-word and
+    # swallow the newline that ends a `# comment`
+    lexer.commenters = ""
+    lexer.whitespace_split = True
+    try:
+        return list(lexer)
+    except ValueError:
+        # Unbalanced quotes: fall back to plain whitespace splitting, line by line
+        words = []
+        for line in command.splitlines():
+            words.extend(line.split())
+            words.append("\n")
+        return words
+
+def command_names(command):
+    """Return the names of the commands a shell command line runs."""
+    names = set()
+    in_command_position = True
+    is_redirect_target = False
+    for token in tokenize(command):
+        if is_redirect_target:
+            is_redirect_target = False
+            continue
+        if set(token) <= OPERATOR_CHARS:
+            if set(token) & REDIRECT_CHARS and not token.endswith("("):
+                # `> file`, `2>&1`, `<<EOF`: the next word is the redirect target
+                is_redirect_target = True
+            else:
+                in_command_position = True
+            continue
+        if token in FIND_EXEC_FLAGS:
+            in_command_position = True
+            continue
+        if not in_command_position:
+            continue
+        if token.startswith("-") or token.isdigit() or ("=" in token and token.split("=", 1)[0].isidentifier()):
+            # Prefix option (e.g. `xargs -0`), redirected fd number (`2>`) or
+            # VAR=value assignment before the command
+            continue
+        names.add(token)
+        in_command_position = token in COMMAND_PREFIXES
+    return names
+
+@functools.lru_cache(maxsize=4)
+def _tool_available(tool_name):
+    """Look a tool up on PATH, once per tool per hook execution."""
+    return shutil.which(tool_name) is not None
 
 def is_tool_available(tool_name):
     """Check if a tool is available in PATH."""
-    if tool_name not in _tool_cache:
-        try:
-            result = subprocess.run(
-                ["which", tool_name],
-                capture_output=True,
-                timeout=1
-            )
-            _tool_cache[tool_name] = result.returncode == 0
-        except Exception:
-            _tool_cache[tool_name] = False
-    return _tool_cache[tool_name]
+    # Allow test override via environment variable
+    test_override = os.environ.get(f"HOOK_TEST_{tool_name.upper()}_AVAILABLE")
+    if test_override is not None:
+        return test_override.lower() == "true"
+
+    return _tool_available(tool_name)
 
 def main():
     try:
@@ -94,9 +161,10 @@ def main():
             sys.exit(0)
 
         suggestions = []
+        commands = command_names(command)
 
         # Check for find command usage
-        if " find " in f" {command} " or command.startswith("find "):
+        if "find" in commands:
             if is_tool_available("fd"):
                 suggestions.append("""
 **Consider using `fd` instead of `find`:**
@@ -108,7 +176,7 @@ def main():
 """)
 
         # Check for grep command usage (but not ripgrep)
-        if (" grep " in f" {command} " or command.startswith("grep ")) and "rg " not in command:
+        if "grep" in commands and "rg" not in commands:
             if is_tool_available("rg"):
                 suggestions.append("""
 **Consider using `rg` (ripgrep) instead of `grep`:**
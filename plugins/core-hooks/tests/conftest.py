@@ -0,0 +1,57 @@
+"""
+Shared helpers for the core-hooks test suite
+
+Test files that exercise a hook in-process load it once at import time with
+load_hook() and drive its main() through run_hook_main(); tests of the
+script's CLI boundary still run the hook as a real subprocess.
+"""
+import importlib.util
+import io
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from unittest.mock import patch
+
+
+def load_hook(path: Path) -> ModuleType:
+    """Load a hook script as a module (hooks guard main() behind __name__ == "__main__")"""
+    spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_hook_main(hook: ModuleType, stdin: str, env: dict[str, str | None] | None = None) -> str:
+    """
+    Run a loaded hook's main() in-process and return what it printed
+
+    Args:
+        hook: Hook module returned by load_hook()
+        stdin: Hook input passed on stdin
+        env: Environment variables to set for the call; None values unset the variable.
+             os.environ is restored afterwards.
+
+    Returns:
+        The hook's stdout
+
+    Raises:
+        RuntimeError: If the hook exits with a non-zero code. Hooks exit 1 only from
+            their catch-all error handler, so a crash never passes as a {} result.
+    """
+    stdout = io.StringIO()
+    with patch.dict(os.environ), \
+            patch.object(sys, "stdin", io.StringIO(stdin)), \
+            patch.object(sys, "stdout", stdout):
+        for name, value in (env or {}).items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        try:
+            hook.main()
+        except SystemExit as e:
+            if e.code not in [0, None]:
+                raise RuntimeError(f"Hook failed with exit code {e.code}")
+
+    return stdout.getvalue()
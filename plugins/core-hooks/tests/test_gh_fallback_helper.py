@@ -2,24 +2,60 @@
 Unit tests for gh-fallback-helper.py hook
 
 This test suite validates that the hook properly detects gh CLI errors and suggests fallbacks.
+
+The hook is loaded as a module once, at import, and run_hook calls its main()
+in-process through conftest.run_hook_main, with stdin/stdout swapped and
+GITHUB_TOKEN set for the call; only the consistency test also runs the hook
+script as a real subprocess.
 """
 import json
+import os
 import subprocess
 import sys
 from pathlib import Path
 
 import pytest
 
+from conftest import load_hook, run_hook_main
+
 # Path to the hook script
 HOOK_PATH = Path(__file__).parent.parent / "hooks" / "gh-fallback-helper.py"
 
+# The hook script loaded as a module, so run_hook can call main() in-process
+hook_module = load_hook(HOOK_PATH)
+
+
+def build_input(
+    tool_name: str,
+    command: str = "",
+    error: str = "",
+    tool_result_error: str = "",
+    tool_input: dict | None = None
+) -> dict:
+    """Hook input for a tool call, with error fields only when they are set"""
+    input_data = {
+        "tool_name": tool_name,
+        "tool_input": {"command": command} if tool_input is None else tool_input
+    }
+
+    # Add error field if provided (PostToolUseFailure)
+    if error:
+        input_data["error"] = error
+
+    # Add tool_result.error if provided (PostToolUse)
+    if tool_result_error:
+        input_data["tool_result"] = {"error": tool_result_error}
+
+    return input_data
+
 
 def run_hook(
     tool_name: str,
     command: str = "",
     error: str = "",
     tool_result_error: str = "",
-    github_token: str = ""
+    github_token: str = "",
+    tool_input: dict | None = None
 ) -> dict:
     """
     Helper function to run the hook with given input and return parsed output
@@ -30,43 +66,34 @@ def run_hook(
         error: Top-level error field (for PostToolUseFailure)
         tool_result_error: Error from tool_result.error field (for PostToolUse)
         github_token: Value to set for GITHUB_TOKEN env var (empty = not set)
+        tool_input: Exact tool_input to send (default: {"command": command})
 
     Returns:
         Parsed JSON output from the hook
     """
-    input_data = {
-        "tool_name": tool_name,
-        "tool_input": {"command": command}
-    }
+    input_data = build_input(tool_name, command, error, tool_result_error, tool_input)
 
-    # Add error field if provided (PostToolUseFailure)
-    if error:
-        input_data["error"] = error
+    # Set GITHUB_TOKEN only when provided (None unsets it for the call)
+    env = {"GITHUB_TOKEN": github_token or None}
+    return json.loads(run_hook_main(hook_module, json.dumps(input_data), env))
 
-    # Add tool_result.error if provided (PostToolUse)
-    if tool_result_error:
-        input_data["tool_result"] = {"error": tool_result_error}
-
-    # Set up environment - inherit parent env and optionally add GITHUB_TOKEN
-    import os
-    env = os.environ.copy()
 
+def run_hook_cli(input_data: dict, github_token: str = "") -> dict:
+    """Run the hook script as a real subprocess and return parsed output"""
+    # Inherit parent env (minus GITHUB_TOKEN) and optionally add GITHUB_TOKEN
+    env = {k: v for k, v in os.environ.items() if k != "GITHUB_TOKEN"}
     if github_token:
         env["GITHUB_TOKEN"] = github_token
-    elif "GITHUB_TOKEN" in env:
-        # Remove GITHUB_TOKEN if explicitly not provided
-        del env["GITHUB_TOKEN"]
 
     result = subprocess.run(
-        ["uv", "run", "--script", str(HOOK_PATH)],
-        input=json.dumps(input_data),
+        [sys.executable, str(HOOK_PATH)],
+        input=json.dumps(input_data).encode("utf-8"),
         capture_output=True,
-        text=True,
         env=env
     )
 
     if result.returncode not in [0]:
-        raise RuntimeError(f"Hook failed: {result.stderr}")
+        raise RuntimeError(f"Hook failed: {result.stderr.decode('utf-8', 'replace')}")
 
     return json.loads(result.stdout)
 
@@ -142,24 +169,22 @@ class TestGhFallbackHelper:
         assert output == {}, "Successful commands should not trigger hook"
 
     # Error detection tests
-    def test_detect_command_not_found_variations(self):
+    @pytest.mark.parametrize("error_msg", [
+        "gh: command not found",
+        "bash: gh: command not found",
+        "/bin/bash: gh: command not found",
+        "gh: not found",
+        "bash: line 1: gh: command not found",
+    ])
+    def test_detect_command_not_found_variations(self, error_msg):
         """Should detect various 'command not found' error formats"""
-        test_cases = [
-            "gh: command not found",
-            "bash: gh: command not found",
-            "/bin/bash: gh: command not found",
-            "gh: not found",
-            "bash: line 1: gh: command not found"
-        ]
-
-        for error_msg in test_cases:
-            output = run_hook(
-                tool_name="Bash",
-                command="gh issue list",
-                error=error_msg,
-                github_token="ghp_test123"
-            )
-            assert "hookSpecificOutput" in output, f"Should detect: {error_msg}"
+        output = run_hook(
+            tool_name="Bash",
+            command="gh issue list",
+            error=error_msg,
+            github_token="ghp_test123"
+        )
+        assert "hookSpecificOutput" in output, f"Should detect: {error_msg}"
 
     def test_gh_command_with_different_error(self):
         """gh command with non-'not found' error should return {}"""
@@ -182,26 +207,24 @@ class TestGhFallbackHelper:
         assert output == {}, "Should only trigger for gh commands"
 
     # Command pattern tests
-    def test_various_gh_commands(self):
+    @pytest.mark.parametrize("cmd", [
+        "gh issue list",
+        "gh pr create",
+        "gh pr view 123",
+        "gh repo clone owner/repo",
+        "gh api /repos/owner/repo",
+        "gh issue create --title 'Test'",
+        "gh pr merge 123",
+    ])
+    def test_various_gh_commands(self, cmd):
         """Should trigger for various gh CLI commands"""
-        gh_commands = [
-            "gh issue list",
-            "gh pr create",
-            "gh pr view 123",
-            "gh repo clone owner/repo",
-            "gh api /repos/owner/repo",
-            "gh issue create --title 'Test'",
-            "gh pr merge 123"
-        ]
-
-        for cmd in gh_commands:
-            output = run_hook(
-                tool_name="Bash",
-                command=cmd,
-                error="gh: command not found",
-                github_token="ghp_test123"
-            )
-            assert "hookSpecificOutput" in output, f"Should trigger for: {cmd}"
+        output = run_hook(
+            tool_name="Bash",
+            command=cmd,
+            error="gh: command not found",
+            github_token="ghp_test123"
+        )
+        assert "hookSpecificOutput" in output, f"Should trigger for: {cmd}"
 
     def test_gh_in_command_chain(self):
         """gh command in command chain should trigger"""
@@ -224,26 +247,24 @@ class TestGhFallbackHelper:
         assert "hookSpecificOutput" in output, "Should detect gh with pipe"
 
     # Edge cases - "gh" as part of word should NOT trigger (tighter matching)
-    def test_gh_as_part_of_word(self):
+    # The hook matches gh as a standalone command to avoid false positives on
+    # words like "high", "light", etc.
+    @pytest.mark.parametrize("cmd,error_msg", [
+        ("echo 'high quality'", "echo: command not found"),
+        ("light on", "light: command not found"),
+        ("weigh options", "weigh: command not found"),
+        ("knight move", "knight: command not found"),
+        ("neighbor check", "neighbor: command not found"),
+    ])
+    def test_gh_as_part_of_word(self, cmd, error_msg):
         """'gh' as part of a larger word should not trigger (tighter matching)"""
-        # The hook checks for "gh " in command or command.startswith("gh")
-        # to avoid false positives on words like "high", "light", etc.
-        test_cases = [
-            ("echo 'high quality'", "echo: command not found"),
-            ("light on", "light: command not found"),
-            ("weigh options", "weigh: command not found"),
-            ("knight move", "knight: command not found"),
-            ("neighbor check", "neighbor: command not found")
-        ]
-
-        for cmd, error_msg in test_cases:
-            output = run_hook(
-                tool_name="Bash",
-                command=cmd,
-                error=error_msg,
-                github_token="ghp_test123"
-            )
-            assert output == {}, f"Should not trigger on word containing 'gh': {cmd}"
+        output = run_hook(
+            tool_name="Bash",
+            command=cmd,
+            error=error_msg,
+            github_token="ghp_test123"
+        )
+        assert output == {}, f"Should not trigger on word containing 'gh': {cmd}"
 
     def test_gh_in_string_literal(self):
         """'gh' inside string literal should NOT trigger (not a standalone gh command)"""
@@ -416,24 +437,22 @@ class TestGhFallbackHelper:
         )
         assert "hookSpecificOutput" in output, "Should trigger for gh with complex args"
 
-    def test_github_token_with_different_formats(self):
+    @pytest.mark.parametrize("token", [
+        "ghp_1234567890abcdef",
+        "github_pat_1234567890",
+        "gho_1234567890",
+        "ghs_1234567890",
+        "fake_token_for_testing",
+    ])
+    def test_github_token_with_different_formats(self, token):
         """Should work with different GITHUB_TOKEN formats"""
-        token_formats = [
-            "ghp_1234567890abcdef",
-            "github_pat_1234567890",
-            "gho_1234567890",
-            "ghs_1234567890",
-            "fake_token_for_testing"
-        ]
-
-        for token in token_formats:
-            output = run_hook(
-                tool_name="Bash",
-                command="gh api /user",
-                error="gh: command not found",
-                github_token=token
-            )
-            assert "hookSpecificOutput" in output, f"Should work with token format: {token[:10]}..."
+        output = run_hook(
+            tool_name="Bash",
+            command="gh api /user",
+            error="gh: command not found",
+            github_token=token
+        )
+        assert "hookSpecificOutput" in output, f"Should work with token format: {token[:10]}..."
 
     # Regression tests
     def test_guidance_is_substantial(self):
@@ -452,40 +471,27 @@ class TestGhFallbackHelper:
 
     def test_consistency_across_multiple_runs(self):
         """Hook should produce consistent output across multiple runs"""
-        outputs = []
-        for _ in range(3):
-            output = run_hook(
-                tool_name="Bash",
-                command="gh issue list",
-                error="gh: command not found",
-                github_token="ghp_test123"
-            )
-            outputs.append(json.dumps(output, sort_keys=True))
+        kwargs = {"tool_name": "Bash", "command": "gh issue list", "error": "gh: command not found"}
+        # One fresh subprocess covers determinism across processes; two in-process
+        # calls cover repeat calls against the same loaded module
+        results = [
+            run_hook_cli(build_input(**kwargs), github_token="ghp_test123"),
+            run_hook(**kwargs, github_token="ghp_test123"),
+            run_hook(**kwargs, github_token="ghp_test123"),
+        ]
+        outputs = [json.dumps(output, sort_keys=True) for output in results]
 
         # All outputs should be identical
         assert len(set(outputs)) == 1, "Hook should produce consistent output"
 
     def test_no_command_field_in_tool_input(self):
         """Missing command field should return {}"""
-        import os
-        input_data = {
-            "tool_name": "Bash",
-            "tool_input": {},  # No command field
-            "error": "gh: command not found"
-        }
-
-        env = os.environ.copy()
-        env["GITHUB_TOKEN"] = "ghp_test123"
-
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True,
-            env=env
+        output = run_hook(
+            tool_name="Bash",
+            error="gh: command not found",
+            github_token="ghp_test123",
+            tool_input={}  # No command field
         )
-
-        output = json.loads(result.stdout)
         assert output == {}, "Missing command field should return {}"
 
 
@@ -493,8 +499,9 @@ def main():
     """Run tests when executed as a script"""
     import pytest
 
-    # Run pytest on this file
-    exit_code = pytest.main([__file__, "-v", "--tb=short"])
+    # Run pytest on this file, spreading test cases across all CPU cores
+    # (pytest-xdist is in the dev dependency group) and skipping the cache plugin
+    exit_code = pytest.main([__file__, "-v", "--tb=short", "-n", "auto", "-p", "no:cacheprovider"])
     sys.exit(exit_code)
 
 
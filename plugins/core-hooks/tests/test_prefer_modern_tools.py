@@ -4,19 +4,43 @@ Unit tests for prefer-modern-tools.py hook
 This test suite uses mocking to test tool availability scenarios regardless of
 what tools are actually installed on the system. All tests should pass on any
 system configuration.
+
+The hook is loaded as a module once, at import, and run_hook calls its main()
+in-process through conftest.run_hook_main, with stdin/stdout swapped and tool
+availability set through the hook's HOOK_TEST_<TOOL>_AVAILABLE overrides; only
+the missing-field tests run the hook script as a real subprocess.
+
+Tests are independent and keep no shared state, so they can be spread across
+cores with pytest-xdist. To iterate on this hook, run just this file rather than
+collecting the whole suite:
+
+    uv run pytest plugins/core-hooks/tests/test_prefer_modern_tools.py -n auto
 """
+import functools
 import json
-import os
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
 
+from conftest import load_hook, run_hook_main
+
 # Path to the hook script
 HOOK_PATH = Path(__file__).parent.parent / "hooks" / "prefer-modern-tools.py"
 
+# The hook script loaded as a module, so run_hook can call main() in-process
+hook_module = load_hook(HOOK_PATH)
+
+
+@functools.lru_cache(maxsize=None)
+def _payload(tool_name: str, command: str) -> str:
+    """Hook stdin JSON for a tool call, encoded once per distinct (tool, command)."""
+    return json.dumps({
+        "tool_name": tool_name,
+        "tool_input": {"command": command}
+    })
+
 
 def run_hook(tool_name: str, command: str, fd_available: bool = True, rg_available: bool = True) -> dict:
     """
@@ -31,113 +55,166 @@ def run_hook(tool_name: str, command: str, fd_available: bool = True, rg_availab
     Returns:
         Parsed JSON output from the hook
     """
-    input_data = {
-        "tool_name": tool_name,
-        "tool_input": {"command": command}
+    availability = {
+        "HOOK_TEST_FD_AVAILABLE": str(fd_available).lower(),
+        "HOOK_TEST_RG_AVAILABLE": str(rg_available).lower(),
     }
 
-    # Create a temporary directory for mock tools and a mock 'which' command
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create a mock 'which' command that only succeeds for available tools
-        which_path = Path(tmpdir) / "which"
-        which_script = "#!/bin/sh\n"
-        which_script += "# Mock which script that controls fd and rg availability\n"
-        which_script += "case \"$1\" in\n"
-
-        # Handle fd
-        if fd_available:
-            which_script += f"  fd) echo '{tmpdir}/fd'; exit 0 ;;\n"
-        else:
-            which_script += "  fd) exit 1 ;;\n"
-
-        # Handle rg
-        if rg_available:
-            which_script += f"  rg) echo '{tmpdir}/rg'; exit 0 ;;\n"
-        else:
-            which_script += "  rg) exit 1 ;;\n"
-
-        # For other commands, use the real which (avoid calling ourselves)
-        which_script += "  *) /usr/bin/which \"$1\" 2>/dev/null || exit 1 ;;\n"
-        which_script += "esac\n"
-        which_path.write_text(which_script)
-        which_path.chmod(0o755)
-
-        # Create mock fd if available
-        if fd_available:
-            fd_path = Path(tmpdir) / "fd"
-            fd_path.write_text("#!/bin/sh\necho 'mock fd'\nexit 0\n")
-            fd_path.chmod(0o755)
-
-        # Create mock rg if available
-        if rg_available:
-            rg_path = Path(tmpdir) / "rg"
-            rg_path.write_text("#!/bin/sh\necho 'mock rg'\nexit 0\n")
-            rg_path.chmod(0o755)
-
-        # Modify PATH to include our mock directory at the beginning
-        # This ensures our mock 'which' is found first
-        env = os.environ.copy()
-        env['PATH'] = f"{tmpdir}:{env.get('PATH', '')}"
-
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True,
-            env=env
-        )
-
-        if result.returncode not in [0, 1]:  # 0 = success, 1 = expected error with {}
-            raise RuntimeError(f"Hook failed: {result.stderr}")
-
-        return json.loads(result.stdout)
+    return json.loads(run_hook_main(hook_module, _payload(tool_name, command), availability))
+
+
+def run_hook_cli(payload: bytes) -> dict:
+    """
+    Run the hook script as a real subprocess on a pre-encoded JSON payload.
+
+    Bytes in and out skip the text-mode codec, and close_fds=False skips closing
+    inherited descriptors before exec; the test process holds none the hook could misuse.
+    """
+    result = subprocess.run(
+        [sys.executable, str(HOOK_PATH)],
+        input=payload,
+        capture_output=True,
+        close_fds=False
+    )
+    return json.loads(result.stdout)
+
+
+# Commands where "find" is not the find command; none should trigger
+NEGATIVE_FIND_CASES = (
+    # find as part of a larger word
+    "pathfinder /tmp",
+    "finder app.py",
+    "findings.txt",
+    "refind-boot",
+    "unfind something",
+    # find in a filename
+    "cat find.txt",
+    "./find-script.sh",
+    "python3 my-find-tool.py",
+    "ls -la findings",
+    "rm -f old_find.log",
+    # find in an environment variable name
+    "echo $FINDPATH",
+    "export FIND_DIR=/tmp",
+    "${FIND_ROOT}/bin/app",
+    "$FINDER_APP",
+    # find as a redirect target
+    "echo hi > find",
+    "ls -la >> find",
+    "sort < find",
+    "make 2> find",
+)
+
+# Commands where "grep" is not the grep command; none should trigger
+NEGATIVE_GREP_CASES = (
+    # grep as part of a larger word
+    "postgres database",
+    "egrep-tool",
+    "grepcode.com",
+    "mgrep utility",
+    "agrep fuzzy",
+    # grep in a filename
+    "cat grep.txt",
+    "./grep-helper.sh",
+    "python3 advanced-grep.py",
+    "ls -la grep_results",
+    "rm -f grep_output.log",
+    # grep in an environment variable name
+    "echo $GREP_COLORS",
+    "export GREP_OPTIONS='--color=auto'",
+    "${GREP_PATH}/bin",
+    "$GREPPY_VAR",
+    # grep as a redirect target
+    "echo hi > grep",
+    "ls -la >> grep",
+    "sort < grep",
+    "make 2>&1 > grep",
+)
+
+# (command, fd available, rg available) combinations whose output must be a JSON object
+JSON_VALIDITY_CASES = (
+    ('find . -name "*.py"', True, False),
+    ('grep "pattern" file.txt', False, True),
+    ('find . | xargs grep "test"', True, True),
+    ("ls -la", False, False),
+    ('rg "pattern"', False, True),
+    ('fd "*.py"', True, False),
+    ("", False, False),
+)
+
+
+# (command, suggests fd when available, suggests rg when available)
+TRIGGER_CASES = (
+    # find
+    pytest.param('find . -name "*.py"', True, False, id="find_basic"),
+    pytest.param('find /path/to/dir -type f', True, False, id="find_type"),
+    pytest.param('find . -name "*.txt" | xargs cat', True, False, id="find_pipe"),
+    pytest.param("find /var/log -type f -name '*.log' -mtime +7 -delete", True, False, id="find_complex_pattern"),
+    pytest.param("find . -name '*.pyc' -exec rm {} \\;", True, False, id="find_exec"),
+    pytest.param("find  .  -name  '*.py'", True, False, id="find_multiple_spaces"),
+    pytest.param("cd /tmp && find .", True, False, id="find_at_end"),
+    pytest.param('for file in $(find /var/log -name "*.log" -mtime +30); do rm "$file"; done', True, False,
+                 id="find_command_substitution"),
+    pytest.param('for file in $( find /var/log -name "*.log" -mtime +30); do rm "$file"; done', True, False,
+                 id="find_command_substitution_spaced"),
+    pytest.param("cd src\n  find . -name '*.py'", True, False, id="find_multiline"),
+    pytest.param("set -e\ncd x\n find .", True, False, id="find_multiline_third_line"),
+    pytest.param("find . \\\n  -name '*.py'", True, False, id="find_line_continuation"),
+    pytest.param("echo hi 2>/dev/null\nfind .", True, False, id="find_after_redirect_line"),
+    pytest.param('cd src  # go to src\nfind . -name "*.py"', True, False, id="find_after_comment_line"),
+    # grep
+    pytest.param('grep -r "pattern" .', False, True, id="grep_recursive"),
+    pytest.param('grep "error" /var/log/syslog', False, True, id="grep_file"),
+    pytest.param('grep -rn "TODO" src/', False, True, id="grep_flags"),
+    pytest.param('cat file.txt | grep "pattern"', False, True, id="grep_pipe"),
+    pytest.param('grep -i "error" logs/*.log', False, True, id="grep_glob"),
+    pytest.param('cd /var/log && grep "error"', False, True, id="grep_at_end"),
+    pytest.param("cat *.log | grep ERROR | sort | uniq -c | sort -rn | head -10", False, True, id="grep_pipeline"),
+    pytest.param("cat *.log|grep ERROR", False, True, id="grep_pipe_no_spaces"),
+    pytest.param('LC_ALL=C grep -r "pattern" .', False, True, id="grep_env_assignment"),
+    pytest.param('for f in *.txt; do grep "x" "$f"; done', False, True, id="grep_in_loop"),
+    pytest.param('sudo grep "error" /var/log/syslog', False, True, id="grep_sudo"),
+    pytest.param('ls | xargs -0 grep "TODO"', False, True, id="grep_xargs"),
+    pytest.param("grep 'unterminated .", False, True, id="grep_unbalanced_quotes"),
+    pytest.param("cd /var/log\ngrep -n error syslog", False, True, id="grep_multiline"),
+    pytest.param("echo 'unterminated\ngrep x f", False, True, id="grep_multiline_unbalanced_quotes"),
+    pytest.param("echo `grep -c x f`", False, True, id="grep_backticks"),
+    pytest.param("2>/dev/null grep x f", False, True, id="grep_after_leading_redirect"),
+    pytest.param("echo ${#arr[@]}; grep x f", False, True, id="grep_after_hash_in_parameter"),
+    pytest.param("git log --format=%h#%s | grep fix", False, True, id="grep_after_hash_in_word"),
+    pytest.param("curl https://x/page#frag | grep foo", False, True, id="grep_after_url_fragment"),
+    pytest.param('grep "test" file.txt && rg "pattern" .', False, False, id="grep_with_rg_already_used"),
+    # both
+    pytest.param('find . -name "*.py" | xargs grep "TODO"', True, True, id="find_xargs_grep"),
+    pytest.param('grep "class" *.py && find . -name "*.pyc" -delete', True, True, id="grep_then_find"),
+    pytest.param('find src/ -type f -name "*.py" -exec grep -l "import pandas" {} \\;', True, True,
+                 id="find_exec_grep"),
+)
+
+# (fd available, rg available) combinations every trigger case runs under
+AVAILABILITY = (
+    pytest.param(True, True, id="both"),
+    pytest.param(True, False, id="fd_only"),
+    pytest.param(False, True, id="rg_only"),
+    pytest.param(False, False, id="neither"),
+)
 
 
 class TestPreferModernTools:
     """Test suite for prefer-modern-tools hook"""
 
-    # ========== Basic find detection tests ==========
-
-    @pytest.mark.parametrize("command,fd_avail,should_trigger", [
-        ('find . -name "*.py"', True, True),
-        ('find . -name "*.py"', False, False),
-        ('find /path/to/dir -type f', True, True),
-        ('find /path/to/dir -type f', False, False),
-        ('find . -name "*.txt" | xargs cat', True, True),
-        ('find . -name "*.txt" | xargs cat', False, False),
-        ('find /var/log -type f -name \'*.log\' -mtime +7 -delete', True, True),
-        ('find . -name \'*.pyc\' -exec rm {} \\;', True, True),
-    ])
-    def test_find_detection(self, command, fd_avail, should_trigger):
-        """Test find detection with various command patterns"""
-        output = run_hook("Bash", command, fd_available=fd_avail)
-        if should_trigger:
-            assert "hookSpecificOutput" in output, f"Should trigger for: {command}"
-            assert "additionalContext" in output["hookSpecificOutput"]
-            assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-        else:
-            assert output == {}, f"Should not trigger for: {command}"
-
-    # ========== Basic grep detection tests ==========
-
-    @pytest.mark.parametrize("command,rg_avail,should_trigger", [
-        ('grep -r "pattern" .', True, True),
-        ('grep -r "pattern" .', False, False),
-        ('grep "error" /var/log/syslog', True, True),
-        ('grep "error" /var/log/syslog', False, False),
-        ('grep -rn "TODO" src/', True, True),
-        ('cat file.txt | grep "pattern"', True, True),
-        ('grep -i "error" logs/*.log', True, True),
-    ])
-    def test_grep_detection(self, command, rg_avail, should_trigger):
-        """Test grep detection with various command patterns"""
-        output = run_hook("Bash", command, rg_available=rg_avail)
-        if should_trigger:
-            assert "hookSpecificOutput" in output, f"Should trigger for: {command}"
-            assert "additionalContext" in output["hookSpecificOutput"]
-            assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-        else:
-            assert output == {}, f"Should not trigger for: {command}"
+    # ========== find/grep detection ==========
+
+    @pytest.mark.parametrize("fd_avail,rg_avail", AVAILABILITY)
+    @pytest.mark.parametrize("command,expect_fd,expect_rg", TRIGGER_CASES)
+    def test_triggers(self, command, expect_fd, expect_rg, fd_avail, rg_avail):
+        """Each detected command gets exactly the suggestions whose tool is available"""
+        output = run_hook("Bash", command, fd_available=fd_avail, rg_available=rg_avail)
+        context = output.get("hookSpecificOutput", {}).get("additionalContext", "")
+        assert ("`fd`" in context) == (expect_fd and fd_avail), f"fd suggestion mismatch for: {command}"
+        assert ("`rg`" in context) == (expect_rg and rg_avail), f"rg suggestion mismatch for: {command}"
+        if not context:
+            assert output == {}, f"Should return {{}} without suggestions for: {command}"
 
     # ========== Commands that should NOT trigger ==========
 
@@ -189,15 +266,9 @@ class TestPreferModernTools:
     # ========== Edge cases - find/grep in strings should NOT trigger ==========
 
     def test_find_in_double_quoted_string(self):
-        """
-        LIMITATION: find inside double-quoted string WILL trigger if it has spaces around it.
-        Hook uses simple substring matching and doesn't parse shell quotes.
-        """
+        """find inside double-quoted string should not trigger"""
         output = run_hook("Bash", 'echo "use find to search"', fd_available=True)
-        # The pattern ' find ' (with spaces) matches "use find to", so it triggers
-        assert "hookSpecificOutput" in output, "Hook triggers even with find in quotes (limitation)"
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
+        assert output == {}, "find in string literal should not trigger"
 
     def test_find_in_single_quoted_string(self):
         """find inside single-quoted string should not trigger"""
@@ -210,9 +281,9 @@ class TestPreferModernTools:
         assert output == {}, "grep in string literal should not trigger"
 
     def test_grep_in_single_quoted_string(self):
-        """grep inside single-quoted string should not trigger (when no spaces around it)"""
+        """grep as a single-quoted argument is one word, not in command position"""
         output = run_hook("Bash", "echo 'grep'", rg_available=True)
-        assert output == {}, "grep without surrounding spaces should not trigger"
+        assert output == {}, "quoted grep argument should not trigger"
 
     def test_git_commit_with_find(self):
         """find in git commit message should not trigger"""
@@ -224,146 +295,32 @@ class TestPreferModernTools:
         output = run_hook("Bash", 'git commit -m "grep through logs"', rg_available=True)
         assert output == {}, "grep in commit message should not trigger"
 
-    # ========== Edge cases - find/grep as part of words should NOT trigger ==========
-
-    @pytest.mark.parametrize("command", [
-        "pathfinder /tmp",
-        "finder app.py",
-        "findings.txt",
-        "refind-boot",
-        "unfind something"
-    ])
-    def test_find_as_part_of_word(self, command):
-        """find as part of a larger word should not trigger"""
-        output = run_hook("Bash", command, fd_available=True)
-        assert output == {}, f"'{command}' should not trigger (find is part of word)"
-
-    @pytest.mark.parametrize("command", [
-        "postgres database",
-        "egrep-tool",
-        "grepcode.com",
-        "mgrep utility",
-        "agrep fuzzy"
-    ])
-    def test_grep_as_part_of_word(self, command):
-        """grep as part of a larger word should not trigger"""
-        output = run_hook("Bash", command, rg_available=True)
-        assert output == {}, f"'{command}' should not trigger (grep is part of word)"
-
-    # ========== Edge cases - find/grep in filenames should NOT trigger ==========
-
-    @pytest.mark.parametrize("command", [
-        "cat find.txt",
-        "./find-script.sh",
-        "python3 my-find-tool.py",
-        "ls -la findings",
-        "rm -f old_find.log"
-    ])
-    def test_find_in_filename(self, command):
-        """find in filename should not trigger"""
-        output = run_hook("Bash", command, fd_available=True)
-        assert output == {}, f"'{command}' should not trigger (find in filename)"
-
-    @pytest.mark.parametrize("command", [
-        "cat grep.txt",
-        "./grep-helper.sh",
-        "python3 advanced-grep.py",
-        "ls -la grep_results",
-        "rm -f grep_output.log"
-    ])
-    def test_grep_in_filename(self, command):
-        """grep in filename should not trigger"""
-        output = run_hook("Bash", command, rg_available=True)
-        assert output == {}, f"'{command}' should not trigger (grep in filename)"
-
-    def test_hook_limitation_quotes_not_parsed(self):
-        """
-        LIMITATION: Hook doesn't parse shell quotes, so ' grep ' pattern in quoted
-        strings will still trigger suggestion. This is a known limitation of simple
-        substring matching.
-        """
-        # This WILL trigger because hook uses simple substring matching
+    def test_grep_word_in_quoted_string(self):
+        """grep as a separate word inside a quoted string should not trigger"""
         output = run_hook("Bash", "echo 'use grep command here'", rg_available=True)
-        # Document actual behavior: it triggers even though grep is in quotes
-        assert "hookSpecificOutput" in output, "Hook triggers even with grep in quotes (limitation)"
-
-    # ========== Multiple suggestions ==========
-
-    @pytest.mark.parametrize("fd_avail,rg_avail,has_fd,has_rg,should_trigger", [
-        (True, True, True, True, True),  # both available
-        (True, False, True, False, True),  # only fd available
-        (False, True, False, True, True),  # only rg available
-        (False, False, False, False, False),  # neither available
-    ])
-    def test_both_find_and_grep_availability(self, fd_avail, rg_avail, has_fd, has_rg, should_trigger):
-        """Command with both find and grep should suggest available tools"""
-        output = run_hook("Bash", 'find . -name "*.py" | xargs grep "TODO"', fd_available=fd_avail, rg_available=rg_avail)
-        if should_trigger:
-            assert "hookSpecificOutput" in output, "Should return hook output"
-            assert "additionalContext" in output["hookSpecificOutput"]
-            assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-        else:
-            assert output == {}, "Should return {} when neither tool is available"
-
-    @pytest.mark.parametrize("fd_avail,rg_avail,has_fd,has_rg", [
-        (True, True, True, True),
-        (False, True, False, True),
-    ])
-    def test_grep_and_find_in_sequence(self, fd_avail, rg_avail, has_fd, has_rg):
-        """Sequential grep and find commands should trigger appropriate suggestions"""
-        output = run_hook("Bash", 'grep "class" *.py && find . -name "*.pyc" -delete', fd_available=fd_avail, rg_available=rg_avail)
-        assert "hookSpecificOutput" in output, "Should return hook output"
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
+        assert output == {}, "grep in string literal should not trigger"
 
-    # ========== Edge cases - environment variables ==========
+    # ========== Edge cases - find/grep as words, filenames, env vars should NOT trigger ==========
 
-    @pytest.mark.parametrize("command", [
-        "echo $FINDPATH",
-        "export FIND_DIR=/tmp",
-        "${FIND_ROOT}/bin/app",
-        "$FINDER_APP"
-    ])
-    def test_find_in_env_var_name(self, command):
-        """Environment variables with find in name should not trigger"""
+    @pytest.mark.parametrize("command", NEGATIVE_FIND_CASES)
+    def test_find_not_a_command(self, command):
+        """find inside a word, filename or env var name should not trigger"""
         output = run_hook("Bash", command, fd_available=True)
-        assert output == {}, f"'{command}' should not trigger (env var, not find command)"
-
-    @pytest.mark.parametrize("command", [
-        "echo $GREP_COLORS",
-        "export GREP_OPTIONS='--color=auto'",
-        "${GREP_PATH}/bin",
-        "$GREPPY_VAR"
-    ])
-    def test_grep_in_env_var_name(self, command):
-        """Environment variables with grep in name should not trigger"""
-        output = run_hook("Bash", command, rg_available=True)
-        assert output == {}, f"'{command}' should not trigger (env var, not grep command)"
+        assert output == {}, f"'{command}' should not trigger (find is not the command)"
 
-    # ========== Commands with rg present should not suggest grep alternative ==========
-
-    def test_grep_with_rg_in_command(self):
-        """If rg is present in command, don't suggest it for grep"""
-        output = run_hook("Bash", 'grep "test" file.txt && rg "pattern" .', rg_available=True)
-        # Per the hook logic: if "rg " appears in the command, it won't suggest rg for grep
-        assert output == {}, "Should not suggest rg if already in command"
+    @pytest.mark.parametrize("command", NEGATIVE_GREP_CASES)
+    def test_grep_not_a_command(self, command):
+        """grep inside a word, filename or env var name should not trigger"""
+        output = run_hook("Bash", command, rg_available=True)
+        assert output == {}, f"'{command}' should not trigger (grep is not the command)"
 
     # ========== Output format validation ==========
 
-    def test_json_output_valid_for_all_cases(self):
-        """All hook outputs should be valid JSON"""
-        test_commands = [
-            ('find . -name "*.py"', True, False),
-            ('grep "pattern" file.txt', False, True),
-            ('find . | xargs grep "test"', True, True),
-            ("ls -la", False, False),
-            ('rg "pattern"', False, True),
-            ('fd "*.py"', True, False),
-            ("", False, False)
-        ]
-        for cmd, fd_avail, rg_avail in test_commands:
-            output = run_hook("Bash", cmd, fd_available=fd_avail, rg_available=rg_avail)
-            assert isinstance(output, dict), f"Output should be valid JSON dict for: {cmd}"
+    @pytest.mark.parametrize("cmd,fd_avail,rg_avail", JSON_VALIDITY_CASES)
+    def test_json_output_valid(self, cmd, fd_avail, rg_avail):
+        """All hook outputs should be valid JSON (parametrized)"""
+        output = run_hook("Bash", cmd, fd_available=fd_avail, rg_available=rg_avail)
+        assert isinstance(output, dict), f"Output should be valid JSON dict for: {cmd}"
 
     def test_hook_event_name_correct_for_find(self):
         """Hook output should include correct event name for find when fd is available"""
@@ -392,32 +349,6 @@ class TestPreferModernTools:
         output = run_hook("Bash", 'grep "pattern" .', rg_available=True)
         assert "decision" not in output.get("hookSpecificOutput", {})
 
-    # ========== Tool availability scenarios ==========
-
-    def test_find_without_fd_installed(self):
-        """When fd is not available, find commands should return {}"""
-        output = run_hook("Bash", 'find . -name "*.py"', fd_available=False)
-        assert output == {}, "Should return {} when fd not available"
-
-    def test_grep_without_rg_installed(self):
-        """When rg is not available, grep commands should return {}"""
-        output = run_hook("Bash", 'grep "pattern" file.txt', rg_available=False)
-        assert output == {}, "Should return {} when rg not available"
-
-    def test_find_with_fd_installed(self):
-        """When fd is available, find commands should return suggestions"""
-        output = run_hook("Bash", 'find . -name "*.py"', fd_available=True)
-        assert "hookSpecificOutput" in output, "Should return suggestions when fd is available"
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-    def test_grep_with_rg_installed(self):
-        """When rg is available, grep commands should return suggestions"""
-        output = run_hook("Bash", 'grep "pattern" file.txt', rg_available=True)
-        assert "hookSpecificOutput" in output, "Should return suggestions when rg is available"
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
     # ========== Guidance presentation validation ==========
 
     def test_find_suggestion_provides_guidance(self):
@@ -432,140 +363,6 @@ class TestPreferModernTools:
         context = output["hookSpecificOutput"]["additionalContext"]
         assert len(context) > 50, "Should provide substantial guidance (>50 chars)"
 
-    # ========== Complex real-world scenarios ==========
-
-    def test_find_in_complex_script(self):
-        """
-        LIMITATION: find in command substitution $(find ...) will NOT trigger.
-        Hook looks for ' find ' (with spaces) but $(find has no space before find.
-        """
-        cmd = 'for file in $(find /var/log -name "*.log" -mtime +30); do rm "$file"; done'
-        output = run_hook("Bash", cmd, fd_available=True)
-        # Pattern ' find ' doesn't match '$(find' (no space before find)
-        assert output == {}, "find in $(find ...) doesn't match ' find ' pattern"
-
-    def test_find_in_complex_script_with_spaces(self):
-        """Complex script with spaced find command should trigger when fd is available"""
-        cmd = 'for file in $( find /var/log -name "*.log" -mtime +30); do rm "$file"; done'
-        output = run_hook("Bash", cmd, fd_available=True)
-        # Now there's a space: '$( find /var' contains ' find '
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-    def test_grep_in_complex_pipeline(self):
-        """Complex pipeline with grep should trigger when rg is available"""
-        cmd = 'cat *.log | grep ERROR | sort | uniq -c | sort -rn | head -10'
-        output = run_hook("Bash", cmd, rg_available=True)
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-    def test_grep_in_complex_pipeline_rg_unavailable(self):
-        """Complex pipeline with grep should NOT trigger when rg is unavailable"""
-        cmd = 'cat *.log | grep ERROR | sort | uniq -c | sort -rn | head -10'
-        output = run_hook("Bash", cmd, rg_available=False)
-        assert output == {}, "Should return {} when rg not available"
-
-    @pytest.mark.parametrize("fd_avail,rg_avail,has_fd,has_rg,should_trigger", [
-        (True, True, True, True, True),
-        (True, False, True, False, True),
-        (False, True, False, True, True),
-        (False, False, False, False, False),
-    ])
-    def test_nested_find_with_grep(self, fd_avail, rg_avail, has_fd, has_rg, should_trigger):
-        """Nested command with find/grep should suggest available tools"""
-        cmd = 'find src/ -type f -name "*.py" -exec grep -l "import pandas" {} \\;'
-        output = run_hook("Bash", cmd, fd_available=fd_avail, rg_available=rg_avail)
-        if should_trigger:
-            assert "hookSpecificOutput" in output, "Should return hook output"
-            assert "additionalContext" in output["hookSpecificOutput"]
-            assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-        else:
-            assert output == {}, "Should return {} when neither tool is available"
-
-    # ========== Edge cases - spacing variations ==========
-
-    def test_find_with_multiple_spaces(self):
-        """find with extra spaces should still trigger when fd is available"""
-        output = run_hook("Bash", "find  .  -name  '*.py'", fd_available=True)
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-    def test_find_at_end_of_command(self):
-        """find at the end of command should trigger when fd is available"""
-        output = run_hook("Bash", "cd /tmp && find .", fd_available=True)
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-    def test_grep_at_end_of_command(self):
-        """grep at the end of command should trigger when rg is available"""
-        output = run_hook("Bash", 'cd /var/log && grep "error"', rg_available=True)
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-    # ========== Tool availability combinations ==========
-
-    def test_both_tools_available(self):
-        """Test scenario where both fd and rg are available"""
-        # find should suggest fd
-        output = run_hook("Bash", 'find . -name "*.py"', fd_available=True, rg_available=True)
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-        # grep should suggest rg
-        output = run_hook("Bash", 'grep "pattern" .', fd_available=True, rg_available=True)
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-    def test_neither_tool_available(self):
-        """Test scenario where neither fd nor rg are available"""
-        # find should return {}
-        output = run_hook("Bash", 'find . -name "*.py"', fd_available=False, rg_available=False)
-        assert output == {}
-
-        # grep should return {}
-        output = run_hook("Bash", 'grep "pattern" .', fd_available=False, rg_available=False)
-        assert output == {}
-
-    def test_only_fd_available_not_rg(self):
-        """Test scenario where only fd is available, not rg"""
-        # find should suggest fd
-        output = run_hook("Bash", 'find . -name "*.py"', fd_available=True, rg_available=False)
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-        # grep should return {}
-        output = run_hook("Bash", 'grep "pattern" .', fd_available=True, rg_available=False)
-        assert output == {}
-
-    def test_only_rg_available_not_fd(self):
-        """Test scenario where only rg is available, not fd"""
-        # find should return {}
-        output = run_hook("Bash", 'find . -name "*.py"', fd_available=False, rg_available=True)
-        assert output == {}
-
-        # grep should suggest rg
-        output = run_hook("Bash", 'grep "pattern" .', fd_available=False, rg_available=True)
-        assert "hookSpecificOutput" in output
-        assert "additionalContext" in output["hookSpecificOutput"]
-        assert len(output["hookSpecificOutput"]["additionalContext"]) > 0
-
-    # ========== Suggestion format validation ==========
-
-    def test_suggestion_format_matches_expected_structure(self):
-        """Verify suggestion format matches expected markdown structure"""
-        output = run_hook("Bash", 'find . -name "*.py"', fd_available=True)
-        context = output["hookSpecificOutput"]["additionalContext"]
-        # Should be non-empty
-        assert len(context) > 0, "Should provide guidance"
-
     # ========== Error handling ==========
 
     def test_missing_tool_input_field(self):
@@ -574,13 +371,7 @@ class TestPreferModernTools:
             "tool_name": "Bash"
             # Missing tool_input
         }
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True
-        )
-        output = json.loads(result.stdout)
+        output = run_hook_cli(json.dumps(input_data).encode("utf-8"))
         assert output == {}, "Missing tool_input should return {}"
 
     def test_missing_command_field(self):
@@ -590,20 +381,14 @@ class TestPreferModernTools:
             "tool_input": {}
             # Missing command
         }
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True
-        )
-        output = json.loads(result.stdout)
+        output = run_hook_cli(json.dumps(input_data).encode("utf-8"))
         assert output == {}, "Missing command should return {}"
 
 
 def main():
     """Run tests when executed as a script"""
     # Run pytest on this file
-    exit_code = pytest.main([__file__, "-v", "--tb=short"])
+    exit_code = pytest.main([__file__, "-v", "--tb=short", "-n", "auto", "-p", "no:cacheprovider"])
     sys.exit(exit_code)
 
 
@@ -2,9 +2,20 @@
 Unit tests for suggest-uv-for-missing-deps.py hook
 
 This test suite validates that the hook properly detects Python dependency errors.
+
+The hook is loaded as a module once, at import, and the run_hook_* helpers call
+its main() in-process through conftest.run_hook_main, with stdin/stdout swapped
+and uv availability set through the hook's HOOK_TEST_UV_AVAILABLE override; only
+the malformed-input and missing-field tests run the hook script as a real
+subprocess.
+
+Tests are independent and keep no shared state, so they can be spread across
+cores with pytest-xdist. To iterate on this hook, run just this file:
+
+    uv run pytest plugins/core-hooks/tests/test_suggest_uv_for_missing_deps.py -n auto
 """
+import functools
 import json
-import os
 import subprocess
 import sys
 import tempfile
@@ -12,9 +23,49 @@ from pathlib import Path
 
 import pytest
 
+from conftest import load_hook, run_hook_main
+
 # Path to the hook script
 HOOK_PATH = Path(__file__).parent.parent / "hooks" / "suggest-uv-for-missing-deps.py"
 
+# The hook script loaded as a module, so the helpers can call main() in-process
+hook_module = load_hook(HOOK_PATH)
+
+
+def run_hook_stdin(stdin: str, uv_available: bool = True) -> dict:
+    """Run the hook's main() in-process on a JSON stdin string and return parsed output"""
+    # Use environment variable to control uv availability (no PATH hacks!)
+    availability = {"HOOK_TEST_UV_AVAILABLE": "true" if uv_available else "false"}
+
+    stdout = run_hook_main(hook_module, stdin, availability)
+    if not stdout:
+        raise RuntimeError("Hook produced no output")
+
+    return json.loads(stdout)
+
+
+def run_hook_input(input_data: dict, uv_available: bool = True) -> dict:
+    """Run the hook's main() in-process on input_data and return parsed output"""
+    return run_hook_stdin(json.dumps(input_data), uv_available=uv_available)
+
+
+@functools.lru_cache(maxsize=None)
+def _error_payload(tool_name: str, command: str, error: str, use_tool_result: bool) -> str:
+    """Hook stdin JSON for a failed tool call, encoded once per distinct input."""
+    if use_tool_result:
+        # PostToolUse format - error in tool_result.error
+        return json.dumps({
+            "tool_name": tool_name,
+            "tool_input": {"command": command},
+            "tool_result": {"error": error}
+        })
+    # PostToolUseFailure format - error in top-level field
+    return json.dumps({
+        "tool_name": tool_name,
+        "tool_input": {"command": command},
+        "error": error
+    })
+
 
 def run_hook_with_error(tool_name: str, command: str, error: str, use_tool_result: bool = False, uv_available: bool = True) -> dict:
     """Helper function to run the hook with error input and return parsed output
@@ -27,40 +78,8 @@ def run_hook_with_error(tool_name: str, command: str, error: str, use_tool_resul
                         If False, place error in top-level error field (PostToolUseFailure)
         uv_available: Whether uv should be treated as available
     """
-    if use_tool_result:
-        # PostToolUse format - error in tool_result.error
-        input_data = {
-            "tool_name": tool_name,
-            "tool_input": {"command": command},
-            "tool_result": {"error": error}
-        }
-    else:
-        # PostToolUseFailure format - error in top-level field
-        input_data = {
-            "tool_name": tool_name,
-            "tool_input": {"command": command},
-            "error": error
-        }
-
-    # Use environment variable to control uv availability (no PATH hacks!)
-    env = os.environ.copy()
-    env["HOOK_TEST_UV_AVAILABLE"] = "true" if uv_available else "false"
-
-    result = subprocess.run(
-        ["uv", "run", "--script", str(HOOK_PATH)],
-        input=json.dumps(input_data),
-        capture_output=True,
-        text=True,
-        env=env
-    )
-
-    if result.returncode not in [0, 1]:  # 0 = success, 1 = expected error with {}
-        raise RuntimeError(f"Hook failed: {result.stderr}")
-
-    if not result.stdout:
-        raise RuntimeError(f"Hook produced no output. stderr: {result.stderr}")
-
-    return json.loads(result.stdout)
+    payload = _error_payload(tool_name, command, error, use_tool_result)
+    return run_hook_stdin(payload, uv_available=uv_available)
 
 
 def run_hook_success(tool_name: str, command: str = "echo test") -> dict:
@@ -70,17 +89,65 @@ def run_hook_success(tool_name: str, command: str = "echo test") -> dict:
         "tool_input": {"command": command}
     }
 
-    result = subprocess.run(
-        ["uv", "run", "--script", str(HOOK_PATH)],
-        input=json.dumps(input_data),
-        capture_output=True,
-        text=True
+    return run_hook_input(input_data)
+
+
+def run_hook_cli(payload: bytes) -> subprocess.CompletedProcess:
+    """Run the hook script as a real subprocess, for tests of its CLI error guard
+
+    Bytes in and out skip the text-mode codec; the hook only emits ASCII JSON,
+    which json.loads accepts as bytes.
+    """
+    return subprocess.run(
+        [sys.executable, str(HOOK_PATH)],
+        input=payload,
+        capture_output=True
     )
 
-    if result.returncode not in [0, 1]:
-        raise RuntimeError(f"Hook failed: {result.stderr}")
 
-    return json.loads(result.stdout)
+PANDAS_ERROR = "ModuleNotFoundError: No module named 'pandas'"
+
+
+@pytest.fixture(scope="module")
+def pandas_trigger_output() -> dict:
+    """Hook output for a pandas ModuleNotFoundError from `python script.py`, shared by
+    the tests that only inspect the standard trigger output."""
+    return run_hook_with_error("Bash", "python script.py", PANDAS_ERROR)
+
+
+# Commands that are not direct script execution; none should trigger
+NEG_COMMANDS = (
+    # python invocations that do not run a script file
+    "python -m pytest tests/",
+    "python -c 'import json'",
+    "python --version",
+    "python --help",
+    "python -i",
+    "which python",
+    "echo '{}' | python -c 'import json; print(json.loads(input()))'",
+    # flags before the script name (intentional limitation)
+    "python -S script.py",
+    "python -u script.py",
+)
+
+# Errors from a python script run that are not missing dependencies; none should trigger
+NEG_ERRORS = (
+    "SyntaxError: invalid syntax",
+    "NameError: name 'foo' is not defined",
+    "ValueError: invalid literal for int() with base 10: 'abc'",
+    "TypeError: unsupported operand type(s) for +: 'int' and 'str'",
+    "AttributeError: module 'pandas' has no attribute 'read_foo'",
+    "FileNotFoundError: [Errno 2] No such file or directory: 'data.csv'",
+)
+
+# (tool, command, error, error in tool_result) inputs whose output must be a JSON object
+JSON_VALIDITY_CASES = (
+    ("Bash", "python script.py", "ModuleNotFoundError: No module named 'pandas'", False),
+    ("Bash", "python script.py", "ImportError: No module named 'requests'", True),
+    ("Bash", "python script.py", "SyntaxError: invalid syntax", False),
+    ("Read", "python script.py", "ModuleNotFoundError: No module named 'numpy'", False),
+    ("Bash", "python -m pytest", "ModuleNotFoundError: No module named 'pytest'", False),
+)
 
 
 class TestSuggestUvForMissingDeps:
@@ -146,14 +213,7 @@ class TestSuggestUvForMissingDeps:
             "tool_result": {"error": "different error"}
         }
 
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True
-        )
-
-        output = json.loads(result.stdout)
+        output = run_hook_input(input_data)
         assert "hookSpecificOutput" in output
         assert "pandas" in output["hookSpecificOutput"]["additionalContext"]
 
@@ -171,34 +231,25 @@ class TestSuggestUvForMissingDeps:
 
         assert "hookSpecificOutput" in output
 
-    # Exclude non-script python commands
-    @pytest.mark.parametrize("command,description", [
-        ("python -m pytest tests/", "python -m should not trigger (different use case)"),
-        ("python -c 'import json'", "python -c should not trigger (not a script file)"),
-        ("python --version", "python --version should not trigger"),
-        ("python --help", "python --help should not trigger"),
-        ("python -i", "python -i should not trigger"),
-        ("which python", "which python should not trigger"),
-        ("echo '{}' | python -c 'import json; print(json.loads(input()))'", "python -c in a pipeline should not trigger"),
-        ("python -S script.py", "python -S script.py should not trigger (intentional limitation)"),
-        ("python -u script.py", "python -u script.py should not trigger (intentional limitation)"),
-    ])
-    def test_non_script_commands_skipped(self, command, description):
+    @pytest.mark.parametrize("command", NEG_COMMANDS)
+    def test_non_script_commands_skipped(self, command):
         """Non-script execution patterns should not trigger hook"""
         error_msg = "ModuleNotFoundError: No module named 'pandas'"
         output = run_hook_with_error("Bash", command, error_msg)
 
         assert output == {}
 
-    # Non-dependency errors should not trigger
-    @pytest.mark.parametrize("error_msg,tool_name,description", [
-        ("SyntaxError: invalid syntax", "Bash", "SyntaxError should not trigger"),
-        ("NameError: name 'foo' is not defined", "Bash", "NameError should not trigger"),
-        ("ModuleNotFoundError: No module named 'pandas'", "Read", "Non-Bash tools should not trigger"),
-    ])
-    def test_non_dependency_errors_not_trigger(self, error_msg, tool_name, description):
-        """Non-dependency errors and non-Bash tools should not trigger"""
-        output = run_hook_with_error(tool_name, "python script.py", error_msg)
+    @pytest.mark.parametrize("error_msg", NEG_ERRORS)
+    def test_non_dependency_errors_not_trigger(self, error_msg):
+        """Non-dependency errors should not trigger"""
+        output = run_hook_with_error("Bash", "python script.py", error_msg)
+
+        assert output == {}
+
+    def test_non_bash_tool_not_trigger(self):
+        """Dependency errors from non-Bash tools should not trigger"""
+        error_msg = "ModuleNotFoundError: No module named 'pandas'"
+        output = run_hook_with_error("Read", "python script.py", error_msg)
 
         assert output == {}
 
@@ -216,44 +267,31 @@ class TestSuggestUvForMissingDeps:
         assert output == {}
 
     # JSON output format validation
-    def test_json_output_structure(self):
+    def test_json_output_structure(self, pandas_trigger_output):
         """Hook output should have correct JSON structure"""
-        error_msg = "ModuleNotFoundError: No module named 'pandas'"
-        output = run_hook_with_error("Bash", "python script.py", error_msg)
+        output = pandas_trigger_output
 
         assert "hookSpecificOutput" in output
         assert "hookEventName" in output["hookSpecificOutput"]
         assert "additionalContext" in output["hookSpecificOutput"]
         assert isinstance(output["hookSpecificOutput"]["additionalContext"], str)
 
-    def test_hook_event_name_correct(self):
+    def test_hook_event_name_correct(self, pandas_trigger_output):
         """Hook output should specify PostToolUseFailure event"""
-        error_msg = "ModuleNotFoundError: No module named 'pandas'"
-        output = run_hook_with_error("Bash", "python script.py", error_msg)
+        output = pandas_trigger_output
 
         assert output["hookSpecificOutput"]["hookEventName"] == "PostToolUseFailure"
 
-    def test_all_outputs_valid_json(self):
+    @pytest.mark.parametrize("tool_name,command,error,use_tool_result", JSON_VALIDITY_CASES)
+    def test_all_outputs_valid_json(self, tool_name, command, error, use_tool_result):
         """All hook outputs should be valid JSON"""
-        test_cases = [
-            ("Bash", "python script.py", "ModuleNotFoundError: No module named 'pandas'", False),
-            ("Bash", "python script.py", "ImportError: No module named 'requests'", True),
-            ("Bash", "python script.py", "SyntaxError: invalid syntax", False),
-            ("Read", "python script.py", "ModuleNotFoundError: No module named 'numpy'", False),
-            ("Bash", "python -m pytest", "ModuleNotFoundError: No module named 'pytest'", False),
-        ]
-
-        for tool_name, command, error, use_tool_result in test_cases:
-            output = run_hook_with_error(tool_name, command, error, use_tool_result)
-            assert isinstance(output, dict), f"Output should be valid JSON dict"
+        output = run_hook_with_error(tool_name, command, error, use_tool_result)
+        assert isinstance(output, dict), f"Output should be valid JSON dict"
 
     # Guidance content verification
-    def test_guidance_includes_module_name_and_content(self):
+    def test_guidance_includes_module_name_and_content(self, pandas_trigger_output):
         """Guidance should include module name and substantial content"""
-        error_msg = "ModuleNotFoundError: No module named 'pandas'"
-        output = run_hook_with_error("Bash", "python script.py", error_msg)
-
-        context = output["hookSpecificOutput"]["additionalContext"]
+        context = pandas_trigger_output["hookSpecificOutput"]["additionalContext"]
         assert "pandas" in context
         assert len(context) > 100  # Has substantial content
 
@@ -329,12 +367,7 @@ ModuleNotFoundError: No module named 'pandas'"""
     # Edge cases - exception handling
     def test_malformed_json_input(self):
         """Hook should handle malformed JSON gracefully"""
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input="{ invalid json }",
-            capture_output=True,
-            text=True
-        )
+        result = run_hook_cli(b"{ invalid json }")
 
         assert result.returncode == 1
         output = json.loads(result.stdout)
@@ -347,12 +380,7 @@ ModuleNotFoundError: No module named 'pandas'"""
             "error": "ModuleNotFoundError: No module named 'pandas'"
         }
 
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True
-        )
+        result = run_hook_cli(json.dumps(input_data).encode("ascii"))
 
         output = json.loads(result.stdout)
         assert output == {}
@@ -364,12 +392,7 @@ ModuleNotFoundError: No module named 'pandas'"""
             "error": "ModuleNotFoundError: No module named 'pandas'"
         }
 
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True
-        )
+        result = run_hook_cli(json.dumps(input_data).encode("ascii"))
 
         output = json.loads(result.stdout)
         assert output == {}
@@ -382,32 +405,22 @@ ModuleNotFoundError: No module named 'pandas'"""
             "error": None
         }
 
-        result = subprocess.run(
-            ["uv", "run", "--script", str(HOOK_PATH)],
-            input=json.dumps(input_data),
-            capture_output=True,
-            text=True
-        )
-
-        output = json.loads(result.stdout)
+        output = run_hook_input(input_data)
         assert output == {}
 
     # uv availability tests - Behavior focused
-    def test_uv_available_provides_guidance(self):
+    def test_uv_available_provides_guidance(self, pandas_trigger_output):
         """When uv is available, hook should provide guidance with substantial content"""
-        error_msg = "ModuleNotFoundError: No module named 'pandas'"
-        output = run_hook_with_error("Bash", "python script.py", error_msg, uv_available=True)
+        output = pandas_trigger_output
 
         assert "hookSpecificOutput" in output
         context = output["hookSpecificOutput"]["additionalContext"]
         assert len(context) > 100  # Substantial guidance provided
 
-    def test_uv_availability_affects_guidance(self):
+    def test_uv_availability_affects_guidance(self, pandas_trigger_output):
         """Guidance should differ based on uv availability"""
-        error_msg = "ModuleNotFoundError: No module named 'pandas'"
-
-        with_uv = run_hook_with_error("Bash", "python script.py", error_msg, uv_available=True)
-        without_uv = run_hook_with_error("Bash", "python script.py", error_msg, uv_available=False)
+        with_uv = pandas_trigger_output
+        without_uv = run_hook_with_error("Bash", "python script.py", PANDAS_ERROR, uv_available=False)
 
         with_uv_context = with_uv["hookSpecificOutput"]["additionalContext"]
         without_uv_context = without_uv["hookSpecificOutput"]["additionalContext"]
@@ -420,7 +433,7 @@ def main():
     import pytest
 
     # Run pytest on this file
-    exit_code = pytest.main([__file__, "-v", "--tb=short"])
+    exit_code = pytest.main([__file__, "-v", "--tb=short", "-n", "auto"])
     sys.exit(exit_code)
 
 